@@ -9,24 +9,38 @@ arXivの新着論文をキーワード検索し、Geminiで日本語解説を生
 """
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import io
+import json
 import os
+import re
 import smtplib
+import sqlite3
 import ssl
 import sys
+import threading
 import time
-import xml.etree.ElementTree as ET
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from email.header import Header
 from email.mime.text import MIMEText
 from pathlib import Path
-from typing import Any, List, Optional, TypedDict
+from typing import Any, Deque, Dict, List, Mapping, Optional, Set, Tuple, TypedDict
 
+import ahocorasick
 import requests
 import yaml
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from google import genai
+from google.genai import errors as genai_errors
+from google.genai import types as genai_types
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
+from urllib3.util.retry import Retry
 
 # --- 型定義 ---
 
@@ -36,6 +50,7 @@ class PaperInfo(TypedDict):
     title: str
     summary: str
     authors: List[str]
+    authors_joined: str
     link: str
     html_link: str
     published: str
@@ -47,9 +62,11 @@ class PaperInfo(TypedDict):
 @dataclass
 class ArxivConfig:
     search_keywords: str
+    keyword_terms: List[str]
     search_category: str
     max_results: int
     request_timeout_seconds: int
+    html_max_bytes: int
 
 
 @dataclass
@@ -59,12 +76,20 @@ class GeminiConfig:
     max_requests_per_minute: int
     max_retries: int
     retry_base_delay_seconds: int
+    batch_max_papers: int
     api_key: Optional[str]
 
 
 @dataclass
 class ProcessingConfig:
-    per_paper_delay_seconds: int
+    html_fetch_max_workers: int
+
+
+@dataclass
+class CacheConfig:
+    enabled: bool
+    path: Path
+    ttl_days: int
 
 
 @dataclass
@@ -107,10 +132,12 @@ class AppConfig:
     arxiv: ArxivConfig
     gemini: GeminiConfig
     processing: ProcessingConfig
+    cache: CacheConfig
     timezone: TimezoneConfig
     mail: MailConfig
     mail_template: MailTemplateConfig
     prompt_template: str
+    batch_prompt_template: str
     test_mode: bool = False
 
 
@@ -234,6 +261,7 @@ def load_config() -> AppConfig:
     arxiv_yaml = get_required_yaml_section(yaml_cfg, "arxiv")
     gemini_yaml = get_required_yaml_section(yaml_cfg, "gemini")
     processing_yaml = get_required_yaml_section(yaml_cfg, "processing")
+    cache_yaml = get_required_yaml_section(yaml_cfg, "cache")
     tz_yaml = get_required_yaml_section(yaml_cfg, "timezone")
     mail_yaml = get_required_yaml_section(yaml_cfg, "mail")
     mail_template_yaml = get_required_yaml_section(yaml_cfg, "mail_template")
@@ -250,13 +278,27 @@ def load_config() -> AppConfig:
     if not prompt_path.is_absolute():
         prompt_path = script_dir / prompt_path
 
+    batch_prompt_path = Path(
+        str(
+            get_required_yaml_value(
+                runtime_yaml,
+                "gemini_batch_prompt_path",
+                "runtime.gemini_batch_prompt_path",
+            )
+        )
+    )
+    if not batch_prompt_path.is_absolute():
+        batch_prompt_path = script_dir / batch_prompt_path
+
     # プロンプトの読み込み
     prompt_template = load_prompt_template(prompt_path)
+    batch_prompt_template = load_prompt_template(batch_prompt_path)
 
     # arXiv設定
     search_keywords = str(get_required_yaml_value(arxiv_yaml, "search_keywords", "arxiv.search_keywords"))
     search_category = str(get_required_yaml_value(arxiv_yaml, "search_category", "arxiv.search_category"))
-    if not parse_csv(search_keywords):
+    keyword_terms = parse_csv(search_keywords)
+    if not keyword_terms:
         print("エラー: settings.public.yaml の 'arxiv.search_keywords' は空要素のみです。")
         sys.exit(1)
     if search_category.lower() != "all" and not parse_csv(search_category):
@@ -265,6 +307,7 @@ def load_config() -> AppConfig:
 
     arxiv_config = ArxivConfig(
         search_keywords=search_keywords,
+        keyword_terms=keyword_terms,
         search_category=search_category,
         max_results=ensure_int(
             get_required_yaml_value(arxiv_yaml, "max_results", "arxiv.max_results"),
@@ -276,6 +319,11 @@ def load_config() -> AppConfig:
             "arxiv.request_timeout_seconds",
             minimum=1,
         ),
+        html_max_bytes=ensure_int(
+            get_required_yaml_value(arxiv_yaml, "html_max_bytes", "arxiv.html_max_bytes"),
+            "arxiv.html_max_bytes",
+            minimum=1,
+        ),
     )
 
     # Gemini設定
@@ -301,19 +349,38 @@ def load_config() -> AppConfig:
             "gemini.retry_base_delay_seconds",
             minimum=1,
         ),
+        batch_max_papers=ensure_int(
+            get_required_yaml_value(gemini_yaml, "batch_max_papers", "gemini.batch_max_papers"),
+            "gemini.batch_max_papers",
+            minimum=1,
+        ),
         api_key=get_env("GEMINI_API_KEY"),
     )
 
     # Processing設定
     processing_config = ProcessingConfig(
-        per_paper_delay_seconds=ensure_int(
+        html_fetch_max_workers=ensure_int(
             get_required_yaml_value(
                 processing_yaml,
-                "per_paper_delay_seconds",
-                "processing.per_paper_delay_seconds",
+                "html_fetch_max_workers",
+                "processing.html_fetch_max_workers",
             ),
-            "processing.per_paper_delay_seconds",
-            minimum=0,
+            "processing.html_fetch_max_workers",
+            minimum=1,
+        ),
+    )
+
+    # Cache設定
+    cache_path = Path(str(get_required_yaml_value(cache_yaml, "path", "cache.path")))
+    if not cache_path.is_absolute():
+        cache_path = script_dir / cache_path
+    cache_config = CacheConfig(
+        enabled=ensure_bool(get_required_yaml_value(cache_yaml, "enabled", "cache.enabled"), "cache.enabled"),
+        path=cache_path,
+        ttl_days=ensure_int(
+            get_required_yaml_value(cache_yaml, "ttl_days", "cache.ttl_days"),
+            "cache.ttl_days",
+            minimum=1,
         ),
     )
 
@@ -411,10 +478,12 @@ def load_config() -> AppConfig:
         arxiv=arxiv_config,
         gemini=gemini_config,
         processing=processing_config,
+        cache=cache_config,
         timezone=timezone_config,
         mail=mail_config,
         mail_template=mail_template_config,
         prompt_template=prompt_template,
+        batch_prompt_template=batch_prompt_template,
         test_mode=test_mode,
     )
 
@@ -423,71 +492,310 @@ def load_config() -> AppConfig:
 
 
 class HttpClient:
-    """共有HTTPセッションを持つHTTPクライアント。"""
-
-    def __init__(self, timeout: int = 30):
+    """共有HTTPセッションを持つHTTPクライアント。
+
+    接続プールを持つアダプタをマウントし、arXiv APIとHTML取得でTCP/TLS接続を使い回す。
+    一時的なエラー（429/5xx）は urllib3 側でバックオフ付きリトライする。
+    """
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        pool_connections: int = 16,
+        pool_maxsize: int = 32,
+        max_retries: int = 3,
+    ):
         self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(
+                total=max_retries,
+                backoff_factor=0.5,
+                status_forcelist=[429, 502, 503, 504],
+            ),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         self._timeout = timeout
 
     def get(self, url: str, **kwargs) -> requests.Response:
         """GETリクエストを実行する。"""
         kwargs.setdefault("timeout", self._timeout)
         response = self._session.get(url, **kwargs)
-        response.raise_for_status()
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            # stream=True の場合も接続をプールへ返すため、送出前に閉じる
+            response.close()
+            raise
         return response
 
     def close(self):
         self._session.close()
 
 
+# --- キャッシュ ---
+
+
+class PaperCache:
+    """論文本文とGemini解説をSQLiteに保存するキャッシュ。
+
+    本文はarXiv ID、解説は「モデル名+プロンプト」のSHA-256をキーとし、ttl_days を過ぎたものは無視する。
+    HTML取得はスレッドプールから呼ばれるため、接続はロックで保護する。
+    """
+
+    def __init__(self, path: Path, ttl_days: int):
+        self._ttl_seconds = ttl_days * 24 * 60 * 60
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS full_texts ("
+                "arxiv_id TEXT PRIMARY KEY, fetched_at INTEGER NOT NULL, text TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "prompt_sha256 TEXT PRIMARY KEY, created_at INTEGER NOT NULL, summary TEXT NOT NULL)"
+            )
+            # 期限切れのエントリを掃除する
+            cutoff = int(time.time()) - self._ttl_seconds
+            self._conn.execute("DELETE FROM full_texts WHERE fetched_at < ?", (cutoff,))
+            self._conn.execute("DELETE FROM summaries WHERE created_at < ?", (cutoff,))
+
+    @staticmethod
+    def summary_key(model_name: str, prompt: str) -> str:
+        """解説キャッシュのキー（モデル名とプロンプトのSHA-256）を返す。"""
+        return hashlib.sha256(f"{model_name}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def _get(self, sql: str, key: str) -> Optional[str]:
+        """読み込みに失敗した場合は警告のみ出し、キャッシュなし扱いにする。"""
+        cutoff = int(time.time()) - self._ttl_seconds
+        try:
+            with self._lock:
+                row = self._conn.execute(sql, (key, cutoff)).fetchone()
+        except sqlite3.Error as e:
+            print(f"警告: キャッシュの読み込みに失敗しました（キャッシュなしで続行します）: {e}")
+            return None
+        return row[0] if row else None
+
+    def _set(self, sql: str, key: str, value: str) -> None:
+        """書き込みに失敗した場合は警告のみ出し、保存を諦める。"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(sql, (key, int(time.time()), value))
+        except sqlite3.Error as e:
+            print(f"警告: キャッシュへの保存に失敗しました: {e}")
+
+    def get_full_text(self, arxiv_id: str) -> Optional[str]:
+        return self._get("SELECT text FROM full_texts WHERE arxiv_id = ? AND fetched_at >= ?", arxiv_id)
+
+    def set_full_text(self, arxiv_id: str, text: str) -> None:
+        self._set("INSERT OR REPLACE INTO full_texts (arxiv_id, fetched_at, text) VALUES (?, ?, ?)", arxiv_id, text)
+
+    def get_summary(self, key: str) -> Optional[str]:
+        return self._get("SELECT summary FROM summaries WHERE prompt_sha256 = ? AND created_at >= ?", key)
+
+    def set_summary(self, key: str, summary: str) -> None:
+        self._set(
+            "INSERT OR REPLACE INTO summaries (prompt_sha256, created_at, summary) VALUES (?, ?, ?)", key, summary
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_cache(config: CacheConfig) -> Optional[PaperCache]:
+    """設定に応じてキャッシュを開く。無効化時や開けない場合はNoneを返す（キャッシュなしで続行）。"""
+    if not config.enabled:
+        return None
+    try:
+        config.path.parent.mkdir(parents=True, exist_ok=True)
+        return PaperCache(config.path, config.ttl_days)
+    except (OSError, sqlite3.Error) as e:
+        print(f"警告: キャッシュを開けませんでした（キャッシュなしで続行します）: {e}")
+        return None
+
+
 # --- Geminiレート制限ガード ---
 
 
 @dataclass
 class RateLimiter:
-    """Gemini APIのレート制限を管理する。"""
+    """Gemini APIのレート制限を管理する。
+
+    直近60秒の送信時刻をスライディングウィンドウで数えて max_requests_per_minute を超えないようにしつつ、
+    送信ペースをAIMD（成功時に加算増加、429/5xx時に乗算減少）で調整する。
+    複数スレッドから同時に呼ばれても枠を重複して使わないよう、送信枠の予約はロック下で行う。
+    応答ヘッダーに残りリクエスト数があれば、余裕があるときは最小間隔を空けずに送信する。
+    """
 
     max_requests_per_minute: int
     max_retries: int = 3
     retry_base_delay_seconds: int = 5
+    increase_step: float = 0.5
+    decrease_factor: float = 0.5
+    _current_rpm: float = field(default=0.0, init=False, repr=False)
     _last_request_time: float = field(default=0.0, init=False, repr=False)
+    _not_before: float = field(default=0.0, init=False, repr=False)
+    _has_headroom: bool = field(default=False, init=False, repr=False)
+    _window: Deque[float] = field(default_factory=deque, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        self._current_rpm = float(self.max_requests_per_minute)
 
     @property
     def min_interval(self) -> float:
-        """リクエスト間の最小間隔（秒）。"""
+        """リクエスト間の最小間隔（秒）。現在のペース（AIMD調整後のRPM）から求める。"""
         if self.max_requests_per_minute <= 0:
             return 0.0
-        return 60.0 / self.max_requests_per_minute
-
-    def wait_if_needed(self):
-        """必要に応じてレート制限のための待機を行う。"""
-        if self.min_interval <= 0:
-            return
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.min_interval:
-            wait_time = self.min_interval - elapsed
+        return 60.0 / self._current_rpm
+
+    def acquire(self):
+        """送信枠を1つ予約し、その送信時刻まで待機する。"""
+        with self._lock:
+            now = time.time()
+            start = max(now, self._not_before)
+            if self.max_requests_per_minute > 0:
+                while self._window and now - self._window[0] >= 60.0:
+                    self._window.popleft()
+
+                interval = 0.0 if self._has_headroom else self.min_interval
+                start = max(start, self._last_request_time + interval)
+                if len(self._window) >= self.max_requests_per_minute:
+                    start = max(start, self._window[-self.max_requests_per_minute] + 60.0)
+                self._window.append(start)
+            self._last_request_time = start
+
+        wait_time = start - now
+        if wait_time > 0:
             print(f"  > レート制限: {wait_time:.1f}秒待機中...")
             time.sleep(wait_time)
 
-    def record_request(self):
-        """リクエスト実行を記録する。"""
-        self._last_request_time = time.time()
+    def record_success(self):
+        """成功時にペースを加算的に上げる（上限は max_requests_per_minute）。"""
+        if self.max_requests_per_minute <= 0:
+            return
+        with self._lock:
+            self._current_rpm = min(float(self.max_requests_per_minute), self._current_rpm + self.increase_step)
 
-    def get_retry_delay(self, attempt: int) -> float:
-        """指数バックオフでリトライ待機時間を計算する。"""
+    def record_throttled(self):
+        """レート制限・サーバーエラー時にペースを乗算的に下げる。"""
+        if self.max_requests_per_minute <= 0:
+            return
+        with self._lock:
+            self._current_rpm = max(1.0, self._current_rpm * self.decrease_factor)
+
+    def record_response_headers(self, headers: Optional[Mapping[str, str]]):
+        """応答ヘッダーのレート制限情報を次回の送信ペースに反映する。
+
+        残りリクエスト数が上限の20%超なら最小間隔の待機を省略し、10%未満なら Retry-After の秒数だけ次回の送信を遅らせる。
+        情報がなければ通常のペースに戻す。
+        Gemini API（generativelanguage.googleapis.com）は通常これらのヘッダーを返さないため、
+        ヘッダーを返すプロキシ等を経由する場合のみ効く補助的な経路であり、多くの場合は何もしない。
+        """
+        lowered = {key.lower(): value for key, value in (headers or {}).items()}
+        remaining = parse_count(lowered.get("x-ratelimit-remaining-requests"))
+        limit = parse_count(lowered.get("x-ratelimit-limit-requests"))
+        retry_after = parse_seconds(lowered.get("retry-after"))
+
+        with self._lock:
+            self._has_headroom = False
+            if remaining is None or not limit:
+                return
+            ratio = remaining / limit
+            if ratio > 0.2:
+                self._has_headroom = True
+            elif ratio < 0.1 and retry_after is not None:
+                self._not_before = max(self._not_before, time.time() + retry_after)
+
+    def get_retry_delay(self, attempt: int, server_delay: Optional[float] = None) -> float:
+        """リトライ待機時間を返す。サーバー指定があればそれを優先し、なければ指数バックオフで計算する。"""
+        if server_delay is not None:
+            return server_delay
         return self.retry_base_delay_seconds * (2 ** attempt)
 
 
+def is_retryable_gemini_error(error: Exception) -> bool:
+    """レート制限（429）またはサーバー側の一時エラー（5xx）かを判定する。入力不正等の4xxは対象外。"""
+    if not isinstance(error, genai_errors.APIError):
+        return False
+    return error.code == 429 or isinstance(error, genai_errors.ServerError)
+
+
+def parse_seconds(value: Any) -> Optional[float]:
+    """ヘッダー等の数値（"30" や "30s" 形式）をfloatに変換する。変換できなければNone。"""
+    if value is None:
+        return None
+    try:
+        return float(str(value).strip().rstrip("s"))
+    except ValueError:
+        return None
+
+
+def parse_count(value: Any) -> Optional[int]:
+    """ヘッダー等の件数を整数に変換する。変換できなければNone。"""
+    if value is None:
+        return None
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
+
+def parse_retry_delay(error: Exception) -> Optional[float]:
+    """APIエラーからサーバー指定の再試行待機秒数（Retry-After / RetryInfo.retryDelay）を取り出す。"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        retry_after = parse_seconds(headers.get("retry-after"))
+        if retry_after is not None:
+            return retry_after
+
+    details = getattr(error, "details", None)
+    if isinstance(details, dict):
+        for item in details.get("error", {}).get("details", []) or []:
+            if isinstance(item, dict) and str(item.get("@type", "")).endswith("RetryInfo"):
+                retry_delay = parse_seconds(item.get("retryDelay"))
+                if retry_delay is not None:
+                    return retry_delay
+    return None
+
+
 # --- Gemini API ---
 
 
+BATCH_RESPONSE_SCHEMA = genai_types.Schema(
+    type=genai_types.Type.ARRAY,
+    items=genai_types.Schema(
+        type=genai_types.Type.OBJECT,
+        properties={
+            "index": genai_types.Schema(type=genai_types.Type.INTEGER),
+            "summary": genai_types.Schema(type=genai_types.Type.STRING),
+        },
+        required=["index", "summary"],
+    ),
+)
+
+
 class GeminiClient:
     """Gemini APIクライアント（レート制限対応）。"""
 
-    def __init__(self, config: GeminiConfig, template: MailTemplateConfig, prompt_template: str):
+    def __init__(
+        self,
+        config: GeminiConfig,
+        template: MailTemplateConfig,
+        prompt_template: str,
+        batch_prompt_template: str,
+        cache: Optional[PaperCache] = None,
+    ):
         self._config = config
         self._template = template
         self._prompt_template = prompt_template
+        self._batch_prompt_template = batch_prompt_template
+        self._cache = cache
         self._client: Optional[genai.Client] = None
         self._rate_limiter = RateLimiter(
             max_requests_per_minute=config.max_requests_per_minute,
@@ -507,86 +815,215 @@ class GeminiClient:
     def is_available(self) -> bool:
         return self._client is not None
 
-    def generate_summary(self, paper: PaperInfo, full_text: str) -> str:
-        """論文の日本語解説を生成する。"""
-        if not self.is_available():
-            return self._template.gemini_skip_message
+    @property
+    def max_concurrency(self) -> int:
+        """同時に投げるリクエスト数の上限。RPM上限の半分（最大8、無制限時は8）とする。"""
+        rpm = self._config.max_requests_per_minute
+        if rpm <= 0:
+            return 8
+        return max(1, min(rpm // 2, 8))
+
+    def can_add_to_batch(self, batch_size: int, batch_chars: int, full_text: str) -> bool:
+        """まとめて1リクエストにする論文群に、もう1本追加できるかを判定する。
+
+        件数は batch_max_papers、本文の合計文字数（各本文は input_max_chars で切り詰め後）は input_max_chars までとする。
+        """
+        if batch_size == 0:
+            return True
+        if batch_size >= self._config.batch_max_papers:
+            return False
+        return batch_chars + min(len(full_text), self._config.input_max_chars) <= self._config.input_max_chars
 
-        # プロンプト生成
+    def _build_prompt(self, paper: PaperInfo, full_text: str) -> str:
+        """1本分の要約プロンプトを生成する。"""
         body = full_text[: self._config.input_max_chars]
-        prompt = render_template_text(
+        return render_template_text(
             self._prompt_template,
             {
                 "title": paper["title"],
-                "authors": ", ".join(paper["authors"]),
+                "authors": paper["authors_joined"],
                 "body": body,
             },
         )
 
-        # リトライ付きでAPI呼び出し
+    def _generate_with_retry(
+        self, contents: str, generation_config: Optional[genai_types.GenerateContentConfig] = None
+    ) -> genai_types.GenerateContentResponse:
+        """リトライ付きでAPIを呼び出す。リトライしても失敗した場合は最後の例外を送出する。"""
         last_error: Optional[Exception] = None
         for attempt in range(self._rate_limiter.max_retries + 1):
             try:
-                self._rate_limiter.wait_if_needed()
+                self._rate_limiter.acquire()
                 response = self._client.models.generate_content(
                     model=self._config.model_name,
-                    contents=prompt,
+                    contents=contents,
+                    config=generation_config,
                 )
-                self._rate_limiter.record_request()
-                return response.text or self._template.gemini_empty_message
+                self._rate_limiter.record_success()
+                http_response = getattr(response, "sdk_http_response", None)
+                self._rate_limiter.record_response_headers(getattr(http_response, "headers", None))
+                return response
 
             except Exception as e:
                 last_error = e
-                error_str = str(e).lower()
-                # レート制限エラー (429) の検出
-                is_rate_limit = "429" in error_str or "rate" in error_str or "quota" in error_str
+                # レート制限(429)・サーバーエラー(5xx)のみペースを落としてリトライする
+                if not is_retryable_gemini_error(e):
+                    break
+                self._rate_limiter.record_throttled()
 
-                if is_rate_limit and attempt < self._rate_limiter.max_retries:
-                    delay = self._rate_limiter.get_retry_delay(attempt)
+                if attempt < self._rate_limiter.max_retries:
+                    delay = self._rate_limiter.get_retry_delay(attempt, parse_retry_delay(e))
                     print(f"  > Geminiレート制限エラー: {delay:.0f}秒後にリトライ ({attempt + 1}/{self._rate_limiter.max_retries})")
                     time.sleep(delay)
                     continue
                 else:
                     break
 
-        print(f"Gemini APIでの解説生成中にエラー: {last_error}")
-        return render_template_text(self._template.gemini_error_message, {"error": last_error})
+        raise last_error
+
+    def _get_cached_summary(self, prompt: str) -> Optional[str]:
+        if self._cache is None:
+            return None
+        cached = self._cache.get_summary(PaperCache.summary_key(self._config.model_name, prompt))
+        if cached is not None:
+            print("  > キャッシュ済みの解説を使用します。")
+        return cached
+
+    def _store_summary(self, prompt: str, summary: str) -> None:
+        if self._cache is not None:
+            self._cache.set_summary(PaperCache.summary_key(self._config.model_name, prompt), summary)
+
+    def _summarize_prompt(self, prompt: str) -> str:
+        """1本分のプロンプトで解説を生成する。"""
+        try:
+            response = self._generate_with_retry(prompt)
+        except Exception as e:
+            print(f"Gemini APIでの解説生成中にエラー: {e}")
+            return render_template_text(self._template.gemini_error_message, {"error": e})
+
+        if not response.text:
+            return self._template.gemini_empty_message
+        self._store_summary(prompt, response.text)
+        return response.text
+
+    def _summarize_batch(self, prompts: List[str]) -> Dict[int, str]:
+        """複数本のプロンプトを1リクエストにまとめて解説を生成する。
+
+        JSON配列で返させて依頼番号ごとに分割する。戻り値は prompts の位置→解説で、取得できなかったものは含まない。
+        リクエスト自体が（リトライ後も）失敗した場合は例外をそのまま送出する。
+        """
+        requests_text = "\n\n".join(f"=== 依頼 {n} ===\n{prompt}" for n, prompt in enumerate(prompts, 1))
+        batch_prompt = render_template_text(
+            self._batch_prompt_template,
+            {"count": len(prompts), "requests": requests_text},
+        )
+        response = self._generate_with_retry(
+            batch_prompt,
+            genai_types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=BATCH_RESPONSE_SCHEMA,
+            ),
+        )
+        try:
+            items = json.loads(response.text or "[]")
+        except ValueError as e:
+            print(f"  > Geminiの一括解説の応答を解析できないため、1本ずつ生成します: {e}")
+            return {}
+
+        summaries: Dict[int, str] = {}
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            index, summary = item.get("index"), item.get("summary")
+            if isinstance(index, int) and 1 <= index <= len(prompts) and isinstance(summary, str) and summary.strip():
+                summaries[index - 1] = summary
+                self._store_summary(prompts[index - 1], summary)
+        return summaries
+
+    def generate_summaries(self, items: List[Tuple[PaperInfo, str]]) -> List[str]:
+        """複数論文の日本語解説を生成する。
+
+        キャッシュにないものが複数あれば1リクエストにまとめ、まとめた応答から欠けた分は1本ずつ生成し直す。
+        まとめたリクエスト自体が失敗した場合は、レート制限を更に圧迫しないよう1本ずつの再試行はせずエラー扱いにする。
+        """
+        if not self.is_available():
+            return [self._template.gemini_skip_message for _ in items]
+
+        prompts = [self._build_prompt(paper, full_text) for paper, full_text in items]
+        results: List[Optional[str]] = [self._get_cached_summary(prompt) for prompt in prompts]
+        pending = [i for i, result in enumerate(results) if result is None]
+
+        if len(pending) > 1:
+            try:
+                batch_results = self._summarize_batch([prompts[i] for i in pending])
+            except Exception as e:
+                print(f"Gemini APIでの一括解説生成中にエラー: {e}")
+                error_message = render_template_text(self._template.gemini_error_message, {"error": e})
+                for i in pending:
+                    results[i] = error_message
+            else:
+                for position, summary in batch_results.items():
+                    results[pending[position]] = summary
+
+        return [
+            result if result is not None else self._summarize_prompt(prompt)
+            for result, prompt in zip(results, prompts)
+        ]
 
 
 # --- arXiv検索 ---
 
 
-def get_required_entry_text(entry: ET.Element, tag: str, ns: dict) -> str:
+# Atomフィードのタグ名（名前空間付きのClark表記を事前に組み立てておく）
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ATOM_ENTRY = f"{ATOM_NS}entry"
+ATOM_ID = f"{ATOM_NS}id"
+ATOM_TITLE = f"{ATOM_NS}title"
+ATOM_SUMMARY = f"{ATOM_NS}summary"
+ATOM_PUBLISHED = f"{ATOM_NS}published"
+ATOM_AUTHOR_NAME = f"{ATOM_NS}author/{ATOM_NS}name"
+
+# arXiv IDのバージョン接尾辞（v1, v2 ...）
+ARXIV_VERSION_SUFFIX_PATTERN = re.compile(r"v\d+$")
+
+
+def get_required_entry_text(entry: etree._Element, tag: str) -> str:
     """XMLエントリから必須テキストを取得する。"""
-    element = entry.find(tag, ns)
+    element = entry.find(tag)
     if element is None or element.text is None:
-        raise ValueError(f"必須フィールドが欠落しています: {tag}")
+        raise ValueError(f"必須フィールドが欠落しています: {etree.QName(tag).localname}")
     return element.text.strip()
 
 
-def build_paper_info(entry: ET.Element, ns: dict, published_dt: datetime) -> PaperInfo:
+def build_paper_info(entry: etree._Element, published_dt: datetime) -> PaperInfo:
     """XMLエントリからメール送信用の論文情報を生成する。"""
-    link = get_required_entry_text(entry, "atom:id", ns)
+    link = get_required_entry_text(entry, ATOM_ID)
     arxiv_id = link.split("/abs/")[-1]
+    authors = [
+        author_name.text.strip()
+        for author_name in entry.findall(ATOM_AUTHOR_NAME)
+        if author_name.text and author_name.text.strip()
+    ]
 
     return {
         "id": arxiv_id,
-        "title": get_required_entry_text(entry, "atom:title", ns),
-        "summary": get_required_entry_text(entry, "atom:summary", ns),
-        "authors": [
-            author_name.text.strip()
-            for author_name in entry.findall("atom:author/atom:name", ns)
-            if author_name.text and author_name.text.strip()
-        ],
+        "title": get_required_entry_text(entry, ATOM_TITLE),
+        "summary": get_required_entry_text(entry, ATOM_SUMMARY),
+        "authors": authors,
+        "authors_joined": ", ".join(authors),
         "link": link,
         "html_link": f"https://arxiv.org/html/{arxiv_id}",
         "published": published_dt.strftime("%Y-%m-%d %H:%M:%S UTC"),
     }
 
 
-def build_search_query(keywords: str, category: str) -> str:
-    """検索キーワードとカテゴリからarXiv検索クエリを組み立てる。"""
-    keyword_terms = parse_csv(keywords)
+def build_search_query(keyword_terms: List[str], category: str) -> str:
+    """検索キーワード（分割済み）とカテゴリからarXiv検索クエリを組み立てる。
+
+    キーワードが空だとカテゴリ全件を走査するクエリになるため、その場合は ValueError を送出する。
+    """
+    if not keyword_terms:
+        raise ValueError("検索キーワードが空です（arxiv.search_keywords を確認してください）")
     keywords_query = [f'(ti:"{kw}" OR abs:"{kw}")' for kw in keyword_terms]
     query = f"({' OR '.join(keywords_query)})"
 
@@ -602,7 +1039,7 @@ def search_arxiv(config: ArxivConfig, tz_config: TimezoneConfig, http: HttpClien
     """arXiv APIでキーワードに合致する前日投稿分（ローカル時間）の論文を検索する。"""
     print(f"キーワード '{config.search_keywords}' で論文を検索中...")
 
-    query = build_search_query(config.search_keywords, config.search_category)
+    query = build_search_query(config.keyword_terms, config.search_category)
     params = {
         "search_query": query,
         "sortBy": "submittedDate",
@@ -616,44 +1053,66 @@ def search_arxiv(config: ArxivConfig, tz_config: TimezoneConfig, http: HttpClien
         print(f"arXiv APIへのリクエスト中にエラー: {e}")
         return []
 
-    root = ET.fromstring(response.content)
-    ns = {"atom": "http://www.w3.org/2005/Atom"}
-
     found_papers: List[PaperInfo] = []
+    # クロスリスト等で同じ論文が重複して返ることがあるため、バージョンを除いたIDで重複を除く
+    seen_ids: Set[str] = set()
     local_tz = tz_config.tz
     target_date = (datetime.now(local_tz) - timedelta(days=1)).date()
 
-    for entry in root.findall("atom:entry", ns):
+    # entry 要素単位で逐次パースし、処理済みの要素は破棄してメモリ使用量を抑える
+    for _, entry in etree.iterparse(io.BytesIO(response.content), events=("end",), tag=ATOM_ENTRY):
         try:
-            published_str = get_required_entry_text(entry, "atom:published", ns)
+            published_str = get_required_entry_text(entry, ATOM_PUBLISHED)
             published_dt = datetime.strptime(published_str, "%Y-%m-%dT%H:%M:%SZ").replace(
                 tzinfo=timezone.utc
             )
             published_local_date = published_dt.astimezone(local_tz).date()
             if published_local_date == target_date:
-                found_papers.append(build_paper_info(entry, ns, published_dt))
+                paper = build_paper_info(entry, published_dt)
+                base_id = ARXIV_VERSION_SUFFIX_PATTERN.sub("", paper["id"])
+                if base_id in seen_ids:
+                    continue
+                seen_ids.add(base_id)
+                found_papers.append(paper)
         except Exception as e:
             print(f"エントリ解析中にスキップ（理由: {e}）")
-            continue
+        finally:
+            entry.clear()
+            while entry.getprevious() is not None:
+                del entry.getparent()[0]
 
     print(f"{len(found_papers)}件の新しい論文が見つかりました。")
     return found_papers
 
 
-def fetch_paper_full_text(html_url: str, http: HttpClient) -> Optional[str]:
-    """論文のHTMLページから本文テキストを抽出する。"""
+# 本文抽出前に除去するタグ（中身ごと削除する）。1つのセレクタにまとめ、木の走査を1回で済ませる
+HTML_STRIP_SELECTOR = ", ".join(["header", "footer", "nav", "script", "style"])
+
+
+def fetch_paper_full_text(html_url: str, http: HttpClient, max_bytes: int) -> Optional[str]:
+    """論文のHTMLページから本文テキストを抽出する。
+
+    極端に大きなページでメモリや解析時間を使い切らないよう、HTMLはストリーミングで
+    先頭 max_bytes（展開後）まで読んだ時点で打ち切り、残りはダウンロード・解析しない。
+    数式の多い論文はHTMLの大半がMathMLで本文テキストはその一部にしかならないため、
+    打ち切られた場合は後半の節（結果・結論等）がGeminiに渡らない点に注意する。
+    """
     try:
         print(f"  > HTML版の本文を取得中: {html_url}")
-        response = http.get(html_url)
-        soup = BeautifulSoup(response.content, "lxml")
-
-        content_div = soup.find("div", class_="ltx_page_content")
-        if content_div:
-            for tag in content_div.find_all(["header", "footer", "nav"]):
-                tag.decompose()
-            return content_div.get_text(separator=" ", strip=True)
-        else:
-            return soup.body.get_text(separator=" ", strip=True) if soup.body else None
+        response = http.get(html_url, stream=True)
+        try:
+            content = response.raw.read(max_bytes, decode_content=True)
+        finally:
+            response.close()
+        tree = LexborHTMLParser(content)
+
+        # 本文コンテナがなければ body 全体を対象にし、どちらも同じ除去・抽出処理（Lexbor側で実行）を通す
+        content_node = tree.css_first("div.ltx_page_content") or tree.body
+        if content_node is None:
+            return None
+        for node in content_node.css(HTML_STRIP_SELECTOR):
+            node.decompose()
+        return content_node.text(separator=" ", strip=True)
 
     except requests.RequestException as e:
         print(f"  > HTMLの取得に失敗: {e}")
@@ -663,20 +1122,52 @@ def fetch_paper_full_text(html_url: str, http: HttpClient) -> Optional[str]:
         return None
 
 
+def load_paper_full_text(
+    paper: PaperInfo, http: HttpClient, config: ArxivConfig, cache: Optional[PaperCache]
+) -> str:
+    """論文本文を取得する。取得できない場合はアブストラクトを返す。
+
+    キャッシュにあればHTML取得を省略し、HTMLから取得できた本文はキャッシュに保存する。
+    """
+    if cache is not None:
+        cached = cache.get_full_text(paper["id"])
+        if cached is not None:
+            print(f"  > キャッシュ済みの本文を使用します: {paper['html_link']}")
+            return cached
+
+    full_text = fetch_paper_full_text(paper["html_link"], http, config.html_max_bytes)
+    if not full_text:
+        print(f"  > HTML版の取得に失敗したため、アブストラクトを要約します: {paper['html_link']}")
+        return paper["summary"]
+    if cache is not None:
+        cache.set_full_text(paper["id"], full_text)
+    return full_text
+
+
 # --- メール作成・送信 ---
 
 
-def build_keyword_counts_section(papers: List[PaperInfo], keywords: str, template: MailTemplateConfig) -> str:
+def build_keyword_counts_section(
+    papers: List[PaperInfo], keyword_list: List[str], template: MailTemplateConfig
+) -> str:
     """キーワードごとの対象件数をメール表示用文字列で返す。"""
-    keyword_list = parse_csv(keywords)
     if not keyword_list:
         return ""
 
-    searchable_texts = [f"{p['title']}\n{p['summary']}".lower() for p in papers]
+    # 全キーワードを1つのAho-Corasickオートマトンにまとめ、各論文のテキストを1回の走査で照合する
+    automaton = ahocorasick.Automaton()
+    for kw in keyword_list:
+        automaton.add_word(kw.lower(), kw.lower())
+    automaton.make_automaton()
+
+    hit_counts: Counter[str] = Counter()
+    for p in papers:
+        text = f"{p['title']}\n{p['summary']}".lower()
+        hit_counts.update({kw for _, kw in automaton.iter(text)})
+
     lines = [template.keyword_counts_title]
     for kw in keyword_list:
-        hit_count = sum(1 for text in searchable_texts if kw.lower() in text)
-        lines.append(f"- {kw}: {hit_count}件")
+        lines.append(f"- {kw}: {hit_counts[kw.lower()]}件")
 
     return "\n".join(lines) + "\n\n"
 
@@ -690,7 +1181,7 @@ def build_paper_section(
 論文 {index}: {paper['title']}
 {template.paper_separator}
 
-著者: {", ".join(paper['authors'])}
+著者: {paper['authors_joined']}
 投稿日: {paper['published']}
 リンク: {paper['link']}
 
@@ -707,46 +1198,146 @@ def build_paper_section(
 """
 
 
-def build_email_body(
+async def build_email_body(
     papers: List[PaperInfo],
     config: AppConfig,
     http: HttpClient,
     gemini: GeminiClient,
+    cache: Optional[PaperCache] = None,
 ) -> str:
     """検索結果からメール本文を構築する。"""
     template = config.mail_template
 
+    # 本文は断片をリストに積み、最後に一度だけ連結する
     # ヘッダー
-    body = render_template_text(
-        template.header,
-        {"keywords": config.arxiv.search_keywords, "count": len(papers)},
-    )
+    parts = [
+        render_template_text(
+            template.header,
+            {"keywords": config.arxiv.search_keywords, "count": len(papers)},
+        )
+    ]
 
     # キーワード別件数
-    body += build_keyword_counts_section(papers, config.arxiv.search_keywords, template)
+    parts.append(build_keyword_counts_section(papers, config.arxiv.keyword_terms, template))
 
     # タイトル一覧
-    body += f"{template.paper_list_title}\n"
-    for i, paper in enumerate(papers, 1):
-        body += f"{i}. {paper['title']}\n"
-    body += "\n"
+    parts.append(f"{template.paper_list_title}\n")
+    parts.extend(f"{i}. {paper['title']}\n" for i, paper in enumerate(papers, 1))
+    parts.append("\n")
 
     # 各論文の詳細
-    for i, paper in enumerate(papers, 1):
-        if i > 1:
-            time.sleep(config.processing.per_paper_delay_seconds)
+    # HTML取得はスレッドプールで先行実行する。本文が揃った順に数本ずつまとめ、
+    # まとめごとのGemini呼び出しはセマフォで同時実行数を絞って並行させる
+    # （送信ペースは GeminiClient 内のレート制限で守られる）
+    semaphore = asyncio.Semaphore(gemini.max_concurrency)
+
+    async def summarize(batch: List[Tuple[int, PaperInfo, str]]) -> List[str]:
+        async with semaphore:
+            for i, paper, _ in batch:
+                print(f"--- 論文 {i}/{len(papers)} の処理を開始: {paper['title']} ---")
+            return await asyncio.to_thread(
+                gemini.generate_summaries, [(paper, full_text) for _, paper, full_text in batch]
+            )
+
+    tasks: List[asyncio.Task[List[str]]] = []
+    with ThreadPoolExecutor(max_workers=config.processing.html_fetch_max_workers) as executor:
+        futures = [
+            executor.submit(load_paper_full_text, paper, http, config.arxiv, cache)
+            for paper in papers
+        ]
+
+        batch: List[Tuple[int, PaperInfo, str]] = []
+        batch_chars = 0
+        for i, (paper, future) in enumerate(zip(papers, futures), 1):
+            full_text = await asyncio.wrap_future(future)
+            if not gemini.can_add_to_batch(len(batch), batch_chars, full_text):
+                tasks.append(asyncio.create_task(summarize(batch)))
+                batch, batch_chars = [], 0
+            batch.append((i, paper, full_text))
+            batch_chars += min(len(full_text), config.gemini.input_max_chars)
+        if batch:
+            tasks.append(asyncio.create_task(summarize(batch)))
+
+        summaries = [summary for batch_summaries in await asyncio.gather(*tasks) for summary in batch_summaries]
+
+    # 出力順は論文の並び順を保つ
+    parts.extend(
+        build_paper_section(i, paper, summary_ja, template)
+        for i, (paper, summary_ja) in enumerate(zip(papers, summaries), 1)
+    )
+
+    return "".join(parts)
+
+
+class SmtpClient:
+    """接続を使い回すSMTPクライアント（コンテキストマネージャ）。
+
+    STARTTLS/ログインは接続時に一度だけ行い、送信前に NOOP で死活確認する。
+    切断されていた場合は再接続してから送信する。
+    """
 
-        print(f"--- 論文 {i}/{len(papers)} の処理を開始: {paper['title']} ---")
+    def __init__(self, config: MailConfig):
+        self._config = config
+        self._context = ssl.create_default_context()
+        self._server: Optional[smtplib.SMTP] = None
 
-        full_text = fetch_paper_full_text(paper["html_link"], http)
-        if not full_text:
-            print("  > HTML版の取得に失敗したため、アブストラクトを要約します。")
-            full_text = paper["summary"]
+    def __enter__(self) -> "SmtpClient":
+        self.connect()
+        return self
 
-        summary_ja = gemini.generate_summary(paper, full_text)
-        body += build_paper_section(i, paper, summary_ja, template)
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
 
-    return body
+    def connect(self) -> None:
+        """SMTPサーバーへ接続し、STARTTLSとログインを行う。"""
+        self.close()
+        server = smtplib.SMTP(self._config.smtp_server, self._config.smtp_port)
+        try:
+            server.starttls(context=self._context)
+            server.login(self._config.smtp_user, self._config.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+
+    def close(self) -> None:
+        """接続を閉じる。"""
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        finally:
+            self._server = None
+
+    def _ensure_connected(self) -> smtplib.SMTP:
+        """接続の死活確認を行い、切断されていれば再接続する。"""
+        if self._server is not None:
+            try:
+                self._server.noop()
+                return self._server
+            except smtplib.SMTPServerDisconnected:
+                self._server = None
+        self.connect()
+        return self._server
+
+    def send(self, msg: MIMEText) -> None:
+        """メッセージを送信する。送信中に切断された場合は一度だけ再接続して再送する。"""
+        try:
+            self._ensure_connected().send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self._server = None
+            self._ensure_connected().send_message(msg)
+
+
+def build_message(subject: str, body: str, mail: MailConfig) -> MIMEText:
+    """送信用のメールメッセージを組み立てる。"""
+    msg = MIMEText(body, "plain", "utf-8")
+    msg["Subject"] = Header(subject, "utf-8")
+    msg["From"] = mail.mail_from
+    msg["To"] = mail.mail_to
+    return msg
 
 
 def send_email(subject: str, body: str, config: AppConfig) -> None:
@@ -764,17 +1355,11 @@ def send_email(subject: str, body: str, config: AppConfig) -> None:
         sys.exit(1)
 
     print(f"{mail.mail_to} 宛にメールを送信中...")
-    msg = MIMEText(body, "plain", "utf-8")
-    msg["Subject"] = Header(subject, "utf-8")
-    msg["From"] = mail.mail_from
-    msg["To"] = mail.mail_to
+    msg = build_message(subject, body, mail)
 
     try:
-        context = ssl.create_default_context()
-        with smtplib.SMTP(mail.smtp_server, mail.smtp_port) as server:
-            server.starttls(context=context)
-            server.login(mail.smtp_user, mail.smtp_password)
-            server.send_message(msg)
+        with SmtpClient(mail) as smtp:
+            smtp.send(msg)
         print("メールが正常に送信されました。")
     except Exception as e:
         print(f"メール送信中にエラーが発生しました: {e}")
@@ -787,7 +1372,10 @@ def main() -> None:
     """メイン処理"""
     config = load_config()
     http = HttpClient(timeout=config.arxiv.request_timeout_seconds)
-    gemini = GeminiClient(config.gemini, config.mail_template, config.prompt_template)
+    cache = open_cache(config.cache)
+    gemini = GeminiClient(
+        config.gemini, config.mail_template, config.prompt_template, config.batch_prompt_template, cache
+    )
 
     try:
         papers = search_arxiv(config.arxiv, config.timezone, http)
@@ -795,10 +1383,12 @@ def main() -> None:
             print("処理対象の論文はありませんでした。")
             return
 
-        body = build_email_body(papers, config, http, gemini)
+        body = asyncio.run(build_email_body(papers, config, http, gemini, cache))
         send_email(config.mail.subject, body, config)
     finally:
         http.close()
+        if cache is not None:
+            cache.close()
 
 
 if __name__ == "__main__":